@@ -1,9 +1,9 @@
 # main.py
 # Entry point for the AI_Project backtesting system
 
-from playground import multi_year_backtest
+from playground import multi_year_backtest, parse_args
 
 if __name__ == "__main__":
     print("🚀 Starting AI_Project Backtest...\n")
-    multi_year_backtest()
+    multi_year_backtest(plots=parse_args().plots)
     
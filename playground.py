@@ -5,13 +5,23 @@ Features:
 - Uses Bollinger Bands for buy/sell signals
 - Sequential trades allowed (same-day rebuys)
 - Creates trade spreadsheet + metrics
-- Generates charts
+- Generates charts for executed trades (optional, --plots)
 - Calculates compound returns per year and over 12 years
+
+Precision: prices, Bollinger Bands and the signal scan use float32 (prices only carry
+~6 significant digits, and float32 halves memory traffic). The rolling sums behind the
+bands are accumulated in float64, and profit % and compounded capital stay float64
+so rounding does not build up across trades.
 """
 
 # Import libraries for data processing, file handling, and charting
-import pandas as pd, numpy as np, os, glob, mplfinance as mpf, matplotlib.pyplot as plt
+import pandas as pd, numpy as np, os, glob, argparse, shutil
+import matplotlib
+matplotlib.use("Agg")  # Charts are only saved to PNG, so skip the interactive GUI backend
+import mplfinance as mpf, matplotlib.pyplot as plt
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from numba import njit, prange
 
 # --- Strategy Parameters ---
 # These control the Bollinger Band calculation and trading rules
@@ -20,6 +30,12 @@ max_hold_days, min_volume = 30, 100000  # Maximum days to hold position and mini
 deviation_threshold = 0.02  # Price must be at least 2% below lower band to trigger buy
 initial_capital = 10000  # Starting capital for backtesting
 years_to_test = list(range(2014, 2026))  # Years to backtest (2014-2025)
+trade_columns = ["Ticker", "Buy_Date", "Buy_Price", "Sell_Date", "Sell_Price", "Profit%", "%Below_Lower", "Days_Held"]
+PLOT_CHARTS = False  # Chart each executed trade during the backtest itself (slow); see render_all_charts / --plots
+data_dir = "YahooStockData"  # Folder of per-ticker daily CSVs
+cache_path = os.path.join(data_dir, "_cache.parquet")  # Parsed copy of every CSV, rebuilt when a CSV changes
+price_dtypes = {"Open": "float32", "High": "float32", "Low": "float32", "Close": "float32", "Volume": "int64"}  # Only columns used by signals and charts
+perf_parquet, perf_csv = "perf.parquet", "perf_all.csv"  # Executed trades for all years (parquet partitioned by Year)
 
 strategy_description = (
     "We use daily Adj Close prices to generate buy signals when the price falls below the "
@@ -29,43 +45,91 @@ strategy_description = (
 
 # ============================================================
 # FUNCTION: calculate_bands
-# PURPOSE: Calculates Bollinger Bands indicators for a stock
-# INPUT: DataFrame with 'Close' prices
-# OUTPUT: Same DataFrame with added SMA, Upper/Lower bands, and %Below_Lower columns
+# PURPOSE: Calculates Bollinger Bands indicators for all stocks at once
+# INPUT: Wide DataFrame of 'Close' prices (rows = dates, one column per stock,
+#        NaN where a stock has no data) over each stock's full history
+# OUTPUT: Dict of SMA, STD, Upper/Lower band and %Below_Lower arrays, same shape as the input
+# NOTE: Run once on all the data so years can be sliced afterwards
+#       without losing the first 19 days of each year to the rolling window
+# ============================================================
+def calculate_bands(closes):
+    # Rolling sums from cumulative sums: every window of every stock in one vectorised pass
+    c = closes.to_numpy(dtype=np.float64)  # One float64 copy of the float32 prices to accumulate in; bands are stored as float32
+    # Windows must run over each stock's own trading days, not the shared calendar, or one missing
+    # day would blank the next 19. So move each stock's prices to the top of its column, in date order
+    rows = np.argsort(np.isnan(c), axis=0, kind="stable")
+    packed = np.take_along_axis(c, rows, axis=0)
+    valid = ~np.isnan(packed)
+    c0 = np.where(valid, packed, 0.0)  # Rows past a stock's last price add nothing to the running sums...
+    zero_row = np.zeros((1, c.shape[1]))
+    csum = np.concatenate((zero_row, np.cumsum(c0, axis=0)))
+    csum2 = np.concatenate((zero_row, np.cumsum(c0 * c0, axis=0)))
+    count = np.concatenate((zero_row, np.cumsum(valid, axis=0)))
+    full = (count[period:] - count[:-period]) == period  # ...and a window only counts if all its days exist
+    mean = np.where(full, (csum[period:] - csum[:-period]) / period, np.nan)
+    mean_sq = (csum2[period:] - csum2[:-period]) / period
+    std = np.sqrt(np.maximum(mean_sq - mean * mean, 0.0) * period / (period - 1))  # Sample std (ddof=1)
+    pad = np.full((min(period - 1, len(c)), c.shape[1]), np.nan)  # First period-1 rows have no full window
+
+    # Put each stock's results back on its own dates (days it has no price get NaN)
+    sma, sd = np.empty_like(c), np.empty_like(c)
+    np.put_along_axis(sma, rows, np.concatenate((pad, mean)), axis=0)
+    np.put_along_axis(sd, rows, np.concatenate((pad, std)), axis=0)
+
+    close = c.astype(np.float32)
+    sma = sma.astype(np.float32)  # Simple Moving Average
+    std = sd.astype(np.float32)  # Standard Deviation
+    upper = sma + std_factor * std  # Upper Bollinger Band
+    lower = sma - std_factor * std  # Lower Bollinger Band
+    below = (lower - close) / close  # How far price is below lower band
+    return {"SMA": sma, "STD": std, "Upper": upper, "Lower": lower, "%Below_Lower": below}
+
+# ============================================================
+# FUNCTION: _scan_signals
+# PURPOSE: Numba-compiled buy/sell state machine behind find_signals
+# - Each stock's scan is independent, so stocks run in parallel (prange)
+# INPUT: Buy/exit condition and has-data matrices (rows = stocks, columns = dates), dates as int64 day numbers
+# OUTPUT: Matrix holding, at each (stock, buy day), the row of the sell day (-1 = no trade)
 # ============================================================
-def calculate_bands(df):
-    df["SMA"] = df["Close"].rolling(period).mean()  # Simple Moving Average
-    df["STD"] = df["Close"].rolling(period).std()  # Standard Deviation
-    df["Upper"] = df["SMA"] + std_factor * df["STD"]  # Upper Bollinger Band
-    df["Lower"] = df["SMA"] - std_factor * df["STD"]  # Lower Bollinger Band
-    df["%Below_Lower"] = (df["Lower"] - df["Close"]) / df["Close"]  # How far price is below lower band
-    return df
+@njit(cache=True, parallel=True)
+def _scan_signals(buy, sell, has_data, dates_i8, max_hold_days):
+    n_stocks, n_days = buy.shape
+    exit_at = np.full((n_stocks, n_days), -1, np.int64)
+    for j in prange(n_stocks):
+        in_position, entry_i = False, 0
+        for i in range(n_days):
+            # Look for buy opportunity when not in a position
+            if not in_position:
+                if buy[j, i]:
+                    in_position, entry_i = True, i
+            # Check exit conditions when holding a position, only on days the stock actually traded
+            # (the shared calendar has days a stock has no price, e.g. after it is delisted)
+            elif has_data[j, i] and (sell[j, i] or dates_i8[i] - dates_i8[entry_i] >= max_hold_days):
+                exit_at[j, entry_i] = i
+                in_position = False
+    return exit_at
 
 # ============================================================
 # FUNCTION: find_signals
-# PURPOSE: Scans stock data to find buy/sell signals using Bollinger Band strategy
+# PURPOSE: Scans all stocks at once to find buy/sell signals using Bollinger Band strategy
 # BUY SIGNAL: Price drops below lower band by >2%, volume > 100k
 # SELL SIGNAL: Price crosses above SMA OR held for 30 days
-# OUTPUT: List of trades (buy_date, buy_price, sell_date, sell_price, deviation, days_held)
-# ============================================================
-def find_signals(df):
-    trades, in_position, entry_date, entry_price = [], False, None, None
-    for i in range(len(df)):
-        today = df.index[i]
-        price, vol = df["Close"].iloc[i], df["Volume"].iloc[i]
-        sma, lower, below = df["SMA"].iloc[i], df["Lower"].iloc[i], df["%Below_Lower"].iloc[i]
-        
-        # Look for buy opportunity when not in a position
-        if not in_position:
-            if price < lower and below > deviation_threshold and vol > min_volume:
-                in_position, entry_date, entry_price = True, today, price
-        else:
-            # Check exit conditions when holding a position
-            days_held = (today - entry_date).days
-            if price > sma or days_held >= max_hold_days:
-                trades.append((entry_date, entry_price, today, price, below, days_held))
-                in_position = False
-    return trades
+# INPUT: Wide (dates x stocks) arrays of Close, Volume, SMA, Lower and %Below_Lower,
+#        and the dates as int64 day numbers (so days held is an int subtraction)
+# OUTPUT: Arrays of (stock column, buy row, sell row) for every trade, grouped by stock in date order
+# ============================================================
+def find_signals(close, vol, sma, lower, below, dates_i8):
+    # Buy/exit conditions for every stock and day in single vectorised passes
+    # (NaN where a stock has no data compares False, so those days never trade)
+    buy = (close < lower) & (below > deviation_threshold) & (vol > min_volume)
+    sell = close > sma
+    has_data = ~np.isnan(close)
+
+    # Only the holding state machine needs a loop; lay each stock's days out contiguously for it
+    exit_at = _scan_signals(np.ascontiguousarray(buy.T), np.ascontiguousarray(sell.T), np.ascontiguousarray(has_data.T),
+                            dates_i8, max_hold_days)
+    stock_idx, entry_idx = np.nonzero(exit_at >= 0)
+    return stock_idx, entry_idx, exit_at[stock_idx, entry_idx]
 
 # ============================================================
 # FUNCTION: plot_chart
@@ -73,13 +137,21 @@ def find_signals(df):
 # - Shows price candles with volume
 # - Overlays SMA and Bollinger Bands
 # - Marks buy signals (green lines) and sell signals (red lines)
+# - Draws onto 'fig' when given (cleared first) so callers can reuse one figure
 # ============================================================
-def plot_chart(df, signals, ticker, year):
+def plot_chart(df, signals, ticker, year, fig=None):
     os.makedirs("plots", exist_ok=True)
+    own_fig = fig is None
+    if own_fig:
+        fig = mpf.figure(style='yahoo', figsize=(10, 8))
+    fig.clear()
+    ax = fig.add_subplot(4, 1, (1, 3))  # Price panel
+    vax = fig.add_subplot(4, 1, 4, sharex=ax)  # Volume panel
+
     # Set up Bollinger Bands and SMA as additional plot layers
-    apds = [mpf.make_addplot(df["Upper"], color='gray', alpha=0.5),
-            mpf.make_addplot(df["Lower"], color='gray', alpha=0.5),
-            mpf.make_addplot(df["SMA"], color='blue', alpha=0.5)]
+    apds = [mpf.make_addplot(df["Upper"], ax=ax, color='gray', alpha=0.5),
+            mpf.make_addplot(df["Lower"], ax=ax, color='gray', alpha=0.5),
+            mpf.make_addplot(df["SMA"], ax=ax, color='blue', alpha=0.5)]
     
     # Create vertical lines for buy (green) and sell (red) dates
     vdates, vcols = [], []
@@ -88,117 +160,272 @@ def plot_chart(df, signals, ticker, year):
         vcols += ["g", "r"]  # green for buy, red for sell
     
     # Generate and save the chart
-    fig, _ = mpf.plot(df, type='candle', volume=True, addplot=apds, style='yahoo',
-        vlines=dict(vlines=vdates, colors=vcols, linewidths=1, linestyle='--'),
-        title=f"{ticker} {year} Signals", returnfig=True)
-    fig.savefig(f"plots/{ticker}_{year}.png"); plt.close(fig)
+    mpf.plot(df, ax=ax, volume=vax, type='candle', addplot=apds,
+        vlines=dict(vlines=vdates, colors=vcols, linewidths=1, linestyle='--'))
+    ax.set_title(f"{ticker} {year} Signals")
+    ax.tick_params(labelbottom=False)  # Dates are shown under the volume panel
+    fig.savefig(f"plots/{ticker}_{year}.png")
+    if own_fig:
+        plt.close(fig)
+
+# ============================================================
+# FUNCTION: render_all_charts
+# PURPOSE: Optional second pass that charts only the trades actually executed
+# INPUT: {year: executed trades DataFrame from backtest_year} and the preloaded stock data
+# - One chart per stock per year, showing all of that stock's trades bought in the year
+#   (the chart runs past Dec 31 when a trade sells in the next year)
+# - Reuses a single figure for every chart instead of allocating one each time
+# ============================================================
+def render_all_charts(executed_trades_by_year, ticker_dfs):
+    fig = mpf.figure(style='yahoo', figsize=(10, 8))
+    for year, trades in executed_trades_by_year.items():
+        for ticker, t in trades.groupby("Ticker", sort=False):
+            signals = list(zip(t["Buy_Date"], t["Buy_Price"], t["Sell_Date"], t["Sell_Price"],
+                               t["%Below_Lower"], t["Days_Held"]))
+            df = ticker_dfs[ticker].loc[f"{year}-01-01":max(t["Sell_Date"].max(), pd.Timestamp(f"{year}-12-31"))]
+            plot_chart(df, signals, ticker, year, fig=fig)
+    plt.close(fig)
+
+# ============================================================
+# FUNCTION: wide_frame
+# PURPOSE: Lines up one column across all stocks for batch calculations
+# OUTPUT: DataFrame with the union of all dates as rows and one column per stock
+#         (NaN where a stock has no data on that date)
+# ============================================================
+def wide_frame(ticker_dfs, column):
+    return pd.DataFrame({ticker: df[column] for ticker, df in ticker_dfs.items()})
+
+# ============================================================
+# FUNCTION: _load_one
+# PURPOSE: Parses one stock CSV for load_all_tickers
+# OUTPUT: (ticker, DataFrame indexed by Date)
+# ============================================================
+def _load_one(csv):
+    ticker = os.path.basename(csv).replace(".csv", "")
+    # Only parse the needed columns, with dtypes given up front and Date parsed straight into the index
+    df = pd.read_csv(csv, usecols=["Date", *price_dtypes], dtype=price_dtypes,
+                     parse_dates=["Date"], index_col="Date", engine="c")
+    return ticker, df
+
+# ============================================================
+# FUNCTION: load_all_tickers
+# PURPOSE: Loads every stock CSV once so each year can slice it instead of re-parsing
+# - Reads the parquet cache when it is newer than all CSVs, readable, and holds exactly their tickers
+# - Otherwise parses the CSVs (8 at a time) and rewrites the cache
+# - Calculates Bollinger Bands once over every stock's full history, all stocks together
+# OUTPUT: Dict of {ticker: DataFrame indexed by sorted Date, with band columns} (for charts),
+#         plus the wide (dates x stocks) Close and Volume frames and band arrays (for the signal scan)
+# ============================================================
+def load_all_tickers():
+    csvs = glob.glob(os.path.join(data_dir, "*.csv"))
+    cached = None
+    if os.path.exists(cache_path) and all(os.path.getmtime(c) <= os.path.getmtime(cache_path) for c in csvs):
+        try:
+            cached = pd.read_parquet(cache_path, columns=list(price_dtypes)).astype(price_dtypes)
+        except (OSError, ValueError):  # Unreadable cache (e.g. truncated by an interrupted write): reparse the CSVs
+            cached = None
+        # File times miss a deleted CSV or one copied in with an older time, so the tickers must match too
+        if cached is not None and set(cached.index.unique(level=0)) != {os.path.basename(c).replace(".csv", "") for c in csvs}:
+            cached = None
+    if cached is not None:
+        ticker_dfs = {ticker: df.droplevel(0) for ticker, df in cached.groupby(level=0, sort=False)}
+    else:
+        # The C parser releases the GIL while reading, so threads parse files in parallel
+        with ThreadPoolExecutor(max_workers=8) as ex:
+            ticker_dfs = dict(ex.map(_load_one, csvs))
+        # Write to a temp file and swap it in, so an interrupted write never leaves a half-written cache
+        tmp_path = cache_path + ".tmp"
+        pd.concat(ticker_dfs, names=["Symbol", "Date"]).to_parquet(tmp_path)
+        os.replace(tmp_path, cache_path)
+
+    # Sort by date once so the cumulative sums behind the bands run in date order
+    # and the chart date-range slices are binary searches
+    ticker_dfs = {ticker: df.sort_index() for ticker, df in ticker_dfs.items()}
+
+    # Band math for all stocks at once on the wide (dates x stocks) Close prices,
+    # then copy each stock's column back onto its own rows
+    closes, volumes = wide_frame(ticker_dfs, "Close"), wide_frame(ticker_dfs, "Volume")
+    bands = calculate_bands(closes)
+    for j, (ticker, df) in enumerate(ticker_dfs.items()):
+        rows = closes.index.get_indexer(df.index)
+        # Build the five band columns as one frame and join it on, instead of writing them one column at a time
+        band_cols = pd.DataFrame({name: values[rows, j] for name, values in bands.items()}, index=df.index)
+        ticker_dfs[ticker] = pd.concat([df, band_cols], axis=1).dropna()
+    return ticker_dfs, closes, volumes, bands
+
+# ============================================================
+# FUNCTION: collect_signals
+# PURPOSE: Finds every stock's buy/sell signals in one scan over its full history
+# - Positions carry across year boundaries (a December buy can sell in January)
+# - Each trade is then assigned to the year it was bought in
+# INPUT: The wide Close/Volume frames and band arrays from load_all_tickers
+# OUTPUT: Dict of {year: list of candidate trades}, each stored as
+#         [ticker, buy_date, buy_price, sell_date, sell_price, profit_pct, %Below_Lower, days_held]
+# ============================================================
+def collect_signals(closes, volumes, bands):
+    # Every stock is already lined up on the same dates, so all of them are scanned together
+    dates, tickers = closes.index.values, closes.columns  # Raw datetime64 dates: no Timestamp per trade
+    dates_i8 = dates.astype("datetime64[D]").view("i8")  # Day numbers, computed once for the scan and days held
+    close = closes.to_numpy()
+    below = bands["%Below_Lower"]
+    stock_idx, entry_idx, exit_idx = find_signals(
+        close, volumes.to_numpy(), bands["SMA"], bands["Lower"], below, dates_i8)
+
+    # Profit calculations for all trades at once
+    buy_prices = close[entry_idx, stock_idx].astype("f8")
+    sell_prices = close[exit_idx, stock_idx].astype("f8")
+    pcts = (sell_prices - buy_prices) / buy_prices * 100
+    days_held = dates_i8[exit_idx] - dates_i8[entry_idx]
+
+    # Calendar year of each buy, so trades land in their own year even if years_to_test has gaps
+    buy_years = dates[entry_idx].astype("datetime64[Y]").astype(int) + 1970
+
+    signals_by_year = {}
+    for year in years_to_test:
+        k = np.flatnonzero(buy_years == year)
+        signals_by_year[year] = [list(row) for row in zip(
+            tickers[stock_idx[k]], dates[entry_idx[k]], buy_prices[k], dates[exit_idx[k]], sell_prices[k],
+            pcts[k], below[exit_idx[k], stock_idx[k]], days_held[k])]
+    return signals_by_year
+
+# ============================================================
+# FUNCTION: _run_sequential
+# PURPOSE: Numba-compiled trade execution behind backtest_year
+# - Walks candidate trades in 'order', taking each one that starts on/after the last sell date
+# - Invests full capital in every taken trade so gains compound
+# INPUT: Buy/sell dates as int64 day numbers, buy/sell prices, sorted row order,
+#        and the first day a trade may be bought (as an int64 day number)
+# OUTPUT: Final capital and a boolean mask of the rows that were executed
+# ============================================================
+@njit(cache=True)
+def _run_sequential(buy_i8, sell_i8, buy_px, sell_px, order, start_i8, initial_capital):
+    capital = float(initial_capital)
+    executed = np.zeros(len(order), np.bool_)
+    next_available = start_i8  # Track next available date to prevent overlapping positions
+    for k in order:
+        # Only take the trade if its buy date is on/after the next available date
+        if buy_i8[k] >= next_available:
+            capital *= sell_px[k] / buy_px[k]  # Execute trade with full capital (all-in strategy)
+            executed[k] = True
+            next_available = sell_i8[k]  # Can buy on the sell day or later
+    return capital, executed
 
 # ============================================================
 # FUNCTION: backtest_year
 # PURPOSE: Runs the trading strategy for a single year across all stocks
 # PROCESS:
-#   1. Scan all CSV files in YahooStockData folder
-#   2. For each stock, calculate Bollinger Bands and find buy/sell signals
-#   3. Sort all potential trades by date (chronologically)
-#   4. Execute trades sequentially using full capital (compounds gains)
-#   5. Save results to CSV and generate charts for executed trades
-# OUTPUT: Compound return % for the year
-# ============================================================
-def backtest_year(year):
-    all_signals = []
-    df_map = {}
-
-    # STEP 1: Collect signals from all tickers for the given year
-    for csv in glob.glob("YahooStockData/*.csv"):
-        ticker = os.path.basename(csv).replace(".csv", "")
-        df = pd.read_csv(csv)
-        df["Date"] = pd.to_datetime(df["Date"])
-        df.set_index("Date", inplace=True)
-        df = df[df.index.year == year]  # Filter to only this year's data
-        if len(df) < period:
-            continue  # Skip if not enough data for moving average
-        df = calculate_bands(df).dropna()  # Calculate indicators
-        signals = find_signals(df)  # Find buy/sell opportunities
-        if not signals:
-            continue
-        df_map[ticker] = df  # Store dataframe for later charting
-        
-        # Convert signals to list format with profit calculations
-        for s in signals:
-            pct = (s[3] - s[1]) / s[1] * 100
-            # store as list: ticker, buy_date, buy_price, sell_date, sell_price, profit_pct, %Below_Lower, days_held
-            all_signals.append([ticker, s[0], s[1], s[2], s[3], pct, s[4], s[5]])
-
-    # STEP 2: If no signals across all tickers, return 0
+#   1. Take the candidate trades bought this year (from collect_signals)
+#   2. Sort all potential trades by date (chronologically)
+#   3. Execute trades sequentially using full capital (compounds gains)
+#   4. Collect the executed trades (and chart them if PLOT_CHARTS is on)
+# INPUT: available_from = sell date of the previous year's last trade; capital is
+#        still invested until then, so no trade this year may be bought before it
+# OUTPUT: Compound return % for the year, and a DataFrame of executed trades
+# ============================================================
+def backtest_year(year, all_signals, ticker_dfs, available_from=None):
+    # STEP 1: If no signals across all tickers, return 0
     if not all_signals:
-        return 0
+        return 0, pd.DataFrame(columns=trade_columns)
 
-    # STEP 3: Sort by buy date, and prefer higher profit on the same buy date
-    all_signals.sort(key=lambda x: (x[1], -x[5]))
+    # Split the candidate trades into one typed array per column
+    cols = list(zip(*all_signals))
+    tickers = np.array(cols[0], dtype=object)
+    buy_dates, sell_dates = (np.array(cols[i], dtype="datetime64[ns]") for i in (1, 3))
+    buy_px, sell_px, pcts, belows = (np.array(cols[i], dtype="f8") for i in (2, 4, 5, 6))
+    held = np.array(cols[7], dtype=np.int64)
 
-    # STEP 4: Execute trades sequentially with compounding capital
-    capital = initial_capital
-    executed_trades = []
-    # Track next available date to prevent overlapping positions
-    next_available_date = pd.Timestamp(year=year, month=1, day=1)
+    # STEP 2: Sort by buy date, and prefer higher profit on the same buy date
+    # np.lexsort sorts by the last key first and is stable, matching list.sort on (date, -profit)
+    order = np.lexsort((-pcts, buy_dates))
 
-    for sig in all_signals:
-        ticker, buy_date, buy_price, sell_date, sell_price, pct, below, days_held = sig
-        # Only take the trade if its buy date is on/after the next available date
-        if buy_date >= next_available_date:
-            # Execute trade with full capital (all-in strategy)
-            shares = capital / buy_price
-            capital = shares * sell_price  # Capital compounds with each trade
-            executed_trades.append([ticker, buy_date, buy_price, sell_date, sell_price, pct, below, days_held])
-            # Update next available date: can buy on the sell day or later
-            next_available_date = sell_date
-            
-            # Generate chart for executed trade
-            try:
-                df = df_map.get(ticker)
-                if df is not None:
-                    # recreate the original signal tuple format for plotting
-                    plot_signals = [(buy_date, buy_price, sell_date, sell_price, below, days_held)]
-                    plot_chart(df, plot_signals, ticker, year)
-            except Exception:
-                pass  # Skip plotting if errors occur
-
-    # STEP 5: Save executed trades for the year to CSV
-    if executed_trades:
-        pd.DataFrame(executed_trades, columns=["Ticker","Buy_Date","Buy_Price","Sell_Date","Sell_Price",
-                                                "Profit%","%Below_Lower","Days_Held"]).to_csv(f"{year}_perf.csv", index=False)
+    # STEP 3: Execute trades sequentially with compounding capital
+    buy_i8, sell_i8 = (d.astype("datetime64[D]").view("i8") for d in (buy_dates, sell_dates))
+    start = np.datetime64(f"{year}-01-01", "D")
+    if available_from is not None:
+        start = max(start, np.datetime64(available_from, "D"))  # Last year's final trade may still be open in January
+    capital, executed = _run_sequential(buy_i8, sell_i8, buy_px, sell_px, order, start.astype(np.int64), initial_capital)
+    taken = order[executed[order]]  # Executed rows, in execution order
+
+    # Generate charts for executed trades (off by default; --plots charts them after the backtest)
+    # Plotting errors are not swallowed: a failing chart should surface, not silently go missing
+    if PLOT_CHARTS:
+        for k in taken:
+            if (df := ticker_dfs.get(tickers[k])) is not None:
+                df = df.loc[f"{year}-01-01":max(sell_dates[k], np.datetime64(f"{year}-12-31"))]
+                # recreate the original signal tuple format for plotting
+                plot_signals = [(pd.Timestamp(buy_dates[k]), buy_px[k], pd.Timestamp(sell_dates[k]), sell_px[k],
+                                 belows[k], held[k])]
+                plot_chart(df, plot_signals, tickers[k], year)
+
+    # STEP 4: Collect executed trades for the year (saved for all years by multi_year_backtest)
+    executed_trades = pd.DataFrame(dict(zip(trade_columns, (
+        tickers[taken], buy_dates[taken], buy_px[taken], sell_dates[taken], sell_px[taken],
+        pcts[taken], belows[taken], held[taken]))))
 
     # Calculate compound return for the year based on sequential single-asset execution
     compound_return = (capital - initial_capital) / initial_capital * 100
-    return compound_return
+    return compound_return, executed_trades
 
 # ============================================================
 # FUNCTION: multi_year_backtest
 # PURPOSE: Main function that runs the backtest across all years (2014-2025)
 # PROCESS:
-#   1. Runs backtest_year() for each year
+#   1. Loads all stock data and scans it for signals once, then runs backtest_year() for every year in order
+#      (each year starts once the previous year's last trade has sold)
 #   2. Compounds the returns across years multiplicatively
 #   3. Saves summary results to results.txt
-#   4. Prints final compound growth factor
+#   4. Saves every executed trade to perf.parquet (partitioned by Year) and perf_all.csv
+#   5. Prints final compound growth factor
+#   6. Charts the executed trades when plots=True
 # ============================================================
-def multi_year_backtest():
-    os.makedirs("plots", exist_ok=True)
+def multi_year_backtest(plots=False):
     with open("results.txt", "w", encoding='utf-8') as f:
         f.write("Strategy Description:\n" + strategy_description + "\n\n")
         f.write("GPT Prompt:\nCreate a stock trading strategy using Bollinger Bands with compound returns tracking\n\n")
         f.write("Multi-Year Backtest Results (2014–2025)\n" + "="*50 + "\n")
 
+        ticker_dfs, closes, volumes, bands = load_all_tickers()  # Parse every CSV once, shared by all years
+        signals_by_year = collect_signals(closes, volumes, bands)  # One signal scan per stock across all years
+        # With the signals already found, each year is only a short compiled loop, so a process pool
+        # would cost more in start-up and data transfer than the years themselves take
+        results, available_from = {}, None
+        for year in years_to_test:
+            results[year] = backtest_year(year, signals_by_year[year], ticker_dfs, available_from)
+            trades = results[year][1]
+            if len(trades):
+                available_from = trades["Sell_Date"].to_numpy()[-1]  # Trades are in execution order
+
         comp_factor = 1  # Tracks cumulative compound growth
         for year in years_to_test[::-1]:  # Reverse order for reporting (2025 -> 2014)
-            gain = backtest_year(year)  # Run backtest for this year
+            gain, _ = results[year]
             comp_factor *= (1 + gain / 100)  # Compound the returns
             f.write(f"Finished processing year {year}. Compounded gain: {gain:.2f}%\n")
         f.write("\nFinal Compounded Return (2014–2025): {:.3f}x\n".format(comp_factor))
-        print(f"\n12-Year Compound Growth: {comp_factor:.3f}x\nResults saved to results.txt")
+
+    # Save all years' executed trades in one go instead of one CSV per year
+    all_trades = pd.concat([trades.assign(Year=year) for year, (_, trades) in results.items()], ignore_index=True)
+    shutil.rmtree(perf_parquet, ignore_errors=True)  # Partitioned writes add files, so clear the last run first
+    all_trades.to_parquet(perf_parquet, partition_cols=["Year"])
+    all_trades.to_csv(perf_csv, index=False)
+    print(f"\n12-Year Compound Growth: {comp_factor:.3f}x\nResults saved to results.txt, {perf_parquet} and {perf_csv}")
+
+    if plots:
+        render_all_charts({year: trades for year, (_, trades) in results.items()}, ticker_dfs)
+        print("Charts saved to plots/")
+
+# ============================================================
+# FUNCTION: parse_args
+# PURPOSE: Command line options shared by playground.py and main.py
+#   --plots  Chart the executed trades after the backtest finishes
+# ============================================================
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Bollinger Bands multi-year backtest (2014-2025)")
+    parser.add_argument("--plots", action="store_true", help="save charts of executed trades to plots/")
+    return parser.parse_args(argv)
 
 # ============================================================
 # SCRIPT ENTRY POINT
 # Runs the multi-year backtest when script is executed directly
 # ============================================================
 if __name__ == "__main__":
-    multi_year_backtest()
+    multi_year_backtest(plots=parse_args().plots)